@@ -1,30 +1,26 @@
 import asyncio
+import glob
 import logging
-import traceback
 import os
 import sys
 import json
 import time
 import random
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from fastmcp import FastMCP
 from pydantic import BaseModel
 from enum import Enum
 from typing import List, Dict, Any, Optional, Union
 from contextlib import asynccontextmanager
+from pathlib import Path
+import re
 import string
 from datetime import datetime
 
 # Configure logging
-import os
-
-# Get the directory of the current script
-script_dir = os.path.dirname(os.path.abspath(__file__))
-# Create logs directory if it doesn't exist
-logs_dir = os.path.join(script_dir, 'logs')
-os.makedirs(logs_dir, exist_ok=True)
-# Set log file path
-log_file = os.path.join(logs_dir, 'serial_MCP.log')
+# Log file lives in a logs directory next to this script
+log_file = Path(__file__).resolve().parent / 'logs' / 'serial_MCP.log'
+log_file.parent.mkdir(exist_ok=True)
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -55,6 +51,34 @@ DEFAULT_PORT = '/dev/tty.usb*'  # Updated to match both usbserial and usbmodem
 DEFAULT_BAUD = 9600
 DEFAULT_BUFFER = 100
 
+def _env_int(name, default):
+    """Read an integer environment variable, falling back to default if unset or invalid"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Invalid value for {name}: {value!r}, using default {default}")
+        return default
+
+# Environment configuration, read once at startup
+CONFIGURED_PORT = os.environ.get(ENV_PORT, DEFAULT_PORT)
+CONFIGURED_BAUD = _env_int(ENV_BAUD, DEFAULT_BAUD)
+CONFIGURED_BUFFER = _env_int(ENV_BUFFER, DEFAULT_BUFFER)
+
+# Receive settings
+READ_TIMEOUT = 0.5  # seconds a blocking read waits for data (reader thread only)
+READ_MAX_BYTES = 4096  # upper bound for a single read
+
+# asyncio.timeout() (Python 3.11+) is cheaper than asyncio.wait_for()
+_HAS_ASYNCIO_TIMEOUT = hasattr(asyncio, "timeout")
+
+# Message validation
+MAX_MESSAGE_LENGTH = 1000  # characters
+# Length and printable check in a single C-level regex pass
+_VALID_MESSAGE = re.compile(f"[{re.escape(string.printable)}]{{1,{MAX_MESSAGE_LENGTH}}}").fullmatch
+
 # Connection Mode enum
 class ConnectionMode(str, Enum):
     REAL = "real"           # Real serial connection
@@ -70,8 +94,20 @@ class ServerState:
         self.serial_available = False
         self.last_error = None
         self.available_ports = []
+        self.available_ports_set = set()  # Same devices as available_ports, for membership tests
         self.last_ports_check = 0
         self.ports_check_interval = 5  # seconds
+        self.cached_ports_payload = None  # Full port details from the last scan
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @mode.setter
+    def mode(self, value):
+        self._mode = value
+        # Plain bool for the per-call connection checks in the tools
+        self.is_disconnected = value is ConnectionMode.DISCONNECTED
 
     def to_dict(self):
         """Convert state to a dictionary for API responses"""
@@ -95,6 +131,11 @@ class ServerState:
         """Clear error state"""
         self.last_error = None
 
+    def invalidate_ports_cache(self):
+        """Force the next port listing to rescan the system"""
+        self.cached_ports_payload = None
+        self.last_ports_check = 0
+
 # Initialize server state
 server_state = ServerState()
 
@@ -121,100 +162,236 @@ class SerialTimeoutError(SerialClientError):
     """Exception raised when a serial operation times out."""
     pass
 
+class MessageBuffer:
+    """Fixed-size ring buffer for received messages.
+    
+    Timestamps and messages live in two preallocated lists, so buffering a
+    message only stores references. When full, the oldest messages are dropped.
+    
+    Single producer / single consumer without a lock: only extend() writes
+    _tail and only drain() writes _head. Both are ever-increasing counters
+    (slot = counter % slots), and CPython int assignment is atomic, so the
+    producer may run in another thread than the consumer. One spare slot
+    guarantees the slot currently being written is never handed out by drain().
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._slots = capacity + 1
+        self._timestamps = [None] * self._slots
+        self._messages = [None] * self._slots
+        self._head = 0  # Next message to read, written by the consumer only
+        self._tail = 0  # Next slot to write, written by the producer only
+
+    def __len__(self):
+        return min(self._tail - self._head, self.capacity)
+
+    def extend(self, timestamp, messages):
+        """Append messages that were received together at timestamp, in ns since the epoch (producer side)."""
+        tail = self._tail
+        for message in messages:
+            slot = tail % self._slots
+            self._timestamps[slot] = timestamp
+            self._messages[slot] = message
+            tail += 1
+            # Publish only after the slot is fully written
+            self._tail = tail
+
+    def drain(self):
+        """Remove and return all buffered messages, oldest first (consumer side)."""
+        tail = self._tail
+        start = max(self._head, tail - self.capacity)
+        # Bulk-copy the occupied slots with at most two slices per list
+        first, last = start % self._slots, tail % self._slots
+        if first <= last:
+            timestamps = self._timestamps[first:last]
+            messages = self._messages[first:last]
+        else:
+            timestamps = self._timestamps[first:] + self._timestamps[:last]
+            messages = self._messages[first:] + self._messages[:last]
+        entries = list(zip(timestamps, messages))
+        # Entries the producer overwrote while we were copying are dropped
+        overwritten = self._tail - self.capacity - start
+        if overwritten > 0:
+            entries = entries[overwritten:]
+        self._head = tail
+        
+        # Messages of one read share a timestamp, so format each distinct one once
+        drained = []
+        last_ts = iso = None
+        for ts, msg in entries:
+            if ts != last_ts:
+                last_ts, iso = ts, datetime.fromtimestamp(ts / 1e9).isoformat()
+            drained.append({"timestamp": iso, "message": msg})
+        return drained
+
 class SerialClient:
     def __init__(self):
         self.serial_port = None
         self.buffer = None
         self.buffer_length = 100
         self.read_task = None
-        self.lock = asyncio.Lock()  # Add lock for thread safety
         self.is_closing = False
         self.receive_task = None  # Task for continuous message receiving
+        self._rx_buf = bytearray()  # Raw bytes of a not yet terminated line
+        self._data_event = asyncio.Event()  # Set by the receive loop when messages are buffered
+        # Single thread for blocking pyserial reads, keeps the event loop free
+        self._reader_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serial-reader")
+        self._reader_fd = None  # Port fd registered with the event loop, if any
+        
+    def _read_blocking(self):
+        """Wait for data, then read everything already waiting. Runs in the reader thread."""
+        # Block (up to READ_TIMEOUT) for the first byte only; read_until would cost a
+        # select + read syscall pair per byte
+        data = self.serial_port.read(1)
+        if data:
+            # Drain the rest in one call; query in_waiting only once
+            waiting = self.serial_port.in_waiting
+            if waiting:
+                data += self.serial_port.read(min(waiting, READ_MAX_BYTES))
+        return data
+
+    def _process_data(self, raw_data):
+        """Split received bytes into lines, validate them and buffer the complete ones."""
+        logger.debug("Read %d bytes", len(raw_data))
+        
+        # Accumulate raw bytes; only complete lines get decoded
+        self._rx_buf.extend(raw_data)
+        
+        # Anything after the last \n is a partial message and stays buffered
+        end = self._rx_buf.rfind(b'\n')
+        if end < 0:
+            return
+        chunk = bytes(self._rx_buf[:end + 1])
+        del self._rx_buf[:end + 1]
+        lines = chunk.split(b'\n')[:-1]
+        
+        # Lines from one read arrive together and share a timestamp (formatted on drain)
+        timestamp = time.time_ns()
+        
+        # Process complete lines
+        batch = []
+        for line_bytes in lines:
+            # Lines are split on \n, so only the \r of a CRLF terminator is left to remove
+            line_bytes = line_bytes.rstrip(b'\r')
+            # Serial traffic is almost always ASCII, which needs no UTF-8 validation
+            if line_bytes.isascii():
+                line = line_bytes.decode('ascii')
+            else:
+                line = line_bytes.decode('utf-8', errors='ignore')
+            # Skip empty and whitespace-only lines
+            if line and not line.isspace():
+                # Basic message validation
+                if not _VALID_MESSAGE(line):
+                    if len(line) > MAX_MESSAGE_LENGTH:  # Skip unreasonably long messages
+                        logger.warning(f"Skipping long message: {line[:50]}...")
+                    else:  # Skip messages with non-printable chars
+                        logger.warning(f"Skipping message with non-printable characters: {line[:50]}...")
+                    continue
+                    
+                batch.append(line)
+                logger.debug("Received: %s", line)
+        
+        if batch:
+            self.buffer.extend(timestamp, batch)
+            self._data_event.set()
+
+    def _start_fd_reader(self):
+        """Have the event loop call _on_readable whenever the port has data (POSIX only).
+        
+        Returns:
+            bool: False if the port or event loop does not support fd readiness,
+                  in which case the threaded receive loop has to be used
+        """
+        try:
+            fd = self.serial_port.fileno()
+            asyncio.get_running_loop().add_reader(fd, self._on_readable)
+        except (AttributeError, NotImplementedError, OSError, ValueError) as e:
+            logger.debug("Event loop fd reader not available (%s), using reader thread", e)
+            return False
+        self._reader_fd = fd
+        self._rx_buf.clear()
+        logger.info("Serial fd reader registered")
+        return True
+
+    def _stop_fd_reader(self):
+        """Unregister the port's file descriptor from the event loop."""
+        if self._reader_fd is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._reader_fd)
+            logger.info("Serial fd reader removed")
+        except Exception as e:
+            logger.error(f"Error removing serial fd reader: {str(e)}")
+        finally:
+            self._reader_fd = None
+
+    def _on_readable(self):
+        """Event loop callback: read what the kernel has buffered for the port."""
+        try:
+            raw_data = os.read(self._reader_fd, READ_MAX_BYTES)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            # The fd stays readable on a failed device, so retrying would only spin
+            self._stop_fd_reader()
+            server_state.set_error(f"Serial connection failed: {str(e)}")
+            server_state.mode = ConnectionMode.DISCONNECTED
+            return
+        
+        if not raw_data:
+            self._stop_fd_reader()
+            server_state.set_error("Serial connection failed: device disconnected")
+            server_state.mode = ConnectionMode.DISCONNECTED
+            return
         
+        try:
+            self._process_data(raw_data)
+        except Exception as e:
+            logger.error(f"Unexpected error processing serial data: {str(e)}")
+            logger.debug("Traceback:", exc_info=True)
+
     async def _receive_loop(self):
         """Continuous loop that receives messages from the serial port."""
-        if not server_state.serial_available or server_state.mode == ConnectionMode.DISCONNECTED:
+        if not server_state.serial_available or server_state.is_disconnected:
             logger.warning("Cannot start receive loop - serial not available or disconnected")
             return
             
         logger.info("Serial receive loop started")
         read_errors = 0
         max_consecutive_errors = 5
-        partial_message = ""
+        self._rx_buf.clear()
+        
+        loop = asyncio.get_running_loop()
         
         while not self.is_closing:
             try:
                 if self.serial_port and self.serial_port.is_open:
-                    waiting = self.serial_port.in_waiting
-                    if waiting > 0:
-                        logger.debug(f"Data available: {waiting} bytes waiting")
-                        try:
-                            # Read raw bytes
-                            raw_data = self.serial_port.read(self.serial_port.in_waiting)
-                            
-                            # Decode with error handling
-                            try:
-                                data = raw_data.decode('utf-8', errors='ignore')
-                            except UnicodeDecodeError:
-                                logger.warning("Failed to decode message, skipping")
-                                continue
+                    try:
+                        # Blocking read in the reader thread; returns what has arrived, or nothing after the read timeout
+                        raw_data = await loop.run_in_executor(self._reader_executor, self._read_blocking)
+                        if raw_data:
+                            self._process_data(raw_data)
                                 
-                            # Handle partial messages
-                            partial_message += data
-                            
-                            # Split into complete lines
-                            lines = partial_message.split('\n')
-                            
-                            # If the last line doesn't end with \n, it's a partial message
-                            if not partial_message.endswith('\n'):
-                                partial_message = lines[-1]
-                                lines = lines[:-1]
-                            else:
-                                partial_message = ""
-                            
-                            # Process complete lines
-                            for line in lines:
-                                line = line.strip()
-                                if line:
-                                    # Basic message validation
-                                    if len(line) > 1000:  # Skip unreasonably long messages
-                                        logger.warning(f"Skipping long message: {line[:50]}...")
-                                        continue
-                                        
-                                    if any(c not in string.printable for c in line):  # Skip messages with non-printable chars
-                                        logger.warning(f"Skipping message with non-printable characters: {line[:50]}...")
-                                        continue
-                                        
-                                    # Add timestamp to message
-                                    timestamp = datetime.now().isoformat()
-                                    message_with_timestamp = {
-                                        "timestamp": timestamp,
-                                        "message": line
-                                    }
-                                        
-                                    async with self.lock:
-                                        self.buffer.append(message_with_timestamp)
-                                        logger.debug(f"Received at {timestamp}: {line}")
-                                        
-                            # Reset error counter on successful read
-                            read_errors = 0
-                            
-                        except serial.SerialException as e:
-                            read_errors += 1
-                            logger.warning(f"Serial read error ({read_errors}/{max_consecutive_errors}): {str(e)}")
-                            if read_errors >= max_consecutive_errors:
-                                logger.error("Too many consecutive read errors, stopping receive loop")
-                                server_state.set_error(f"Serial connection failed: {str(e)}")
-                                server_state.mode = ConnectionMode.DISCONNECTED
-                                break
-                            await asyncio.sleep(0.1)
-                await asyncio.sleep(0.01)
+                        # Reset error counter on successful read
+                        read_errors = 0
+                        
+                    except serial.SerialException as e:
+                        read_errors += 1
+                        logger.warning(f"Serial read error ({read_errors}/{max_consecutive_errors}): {str(e)}")
+                        if read_errors >= max_consecutive_errors:
+                            logger.error("Too many consecutive read errors, stopping receive loop")
+                            server_state.set_error(f"Serial connection failed: {str(e)}")
+                            server_state.mode = ConnectionMode.DISCONNECTED
+                            break
+                        await asyncio.sleep(0.1)
+                else:
+                    await asyncio.sleep(0.01)
             except asyncio.CancelledError:
                 logger.info("Receive loop task cancelled")
                 break
             except Exception as e:
                 logger.error(f"Unexpected error in receive loop: {str(e)}")
-                logger.debug(traceback.format_exc())
+                logger.debug("Traceback:", exc_info=True)
                 read_errors += 1
                 if read_errors >= max_consecutive_errors:
                     logger.error("Too many errors in receive loop, stopping")
@@ -243,7 +420,6 @@ class SerialClient:
         # Handle wildcard in port name
         if '*' in port:
             try:
-                import glob
                 matching_ports = glob.glob(port)
                 if matching_ports:
                     port = matching_ports[0]  # Use the first matching port
@@ -275,14 +451,14 @@ class SerialClient:
             
             # Try to open the serial port
             try:
-                self.serial_port = serial.Serial(port, baudrate, timeout=0.1)
+                self.serial_port = serial.Serial(port, baudrate, timeout=READ_TIMEOUT)
                 server_state.mode = ConnectionMode.REAL
             except serial.SerialException as e:
                 logger.warning(f"Failed to open serial port {port}: {str(e)}")
                 
                 # Check if port exists at all
-                ports = await self.list_ports()
-                exists = any(p.get("device") == port for p in ports.get("ports", []))
+                await self.list_ports()
+                exists = port in server_state.available_ports_set
                 
                 if not exists:
                     logger.warning(f"Port {port} does not exist")
@@ -294,16 +470,19 @@ class SerialClient:
                     raise SerialConnectionError(f"Failed to open serial port {port}: {str(e)}")
             
             # Initialize buffer and start receive task
-            self.buffer = deque(maxlen=buffer_length)
+            self.buffer = MessageBuffer(buffer_length)
             self.buffer_length = buffer_length
             self.is_closing = False
-            self.receive_task = asyncio.create_task(self._receive_loop())
+            # Prefer kernel readiness notifications; fall back to the reader thread (e.g. Windows)
+            if not self._start_fd_reader():
+                self.receive_task = asyncio.create_task(self._receive_loop())
             
             # Update server state
             server_state.mode = ConnectionMode.REAL
             server_state.port = port
             server_state.baudrate = baudrate
             server_state.buffer_length = buffer_length
+            server_state.invalidate_ports_cache()
             
             logger.info(f"Serial initialized on {port} at {baudrate} baud")
             return {"status": "initialized", "mode": "real", "port": port, "baudrate": baudrate}
@@ -316,17 +495,20 @@ class SerialClient:
             return {"status": "error", "error_type": "ValueError", "error": str(e)}
         except Exception as e:
             server_state.set_error(f"Unexpected error initializing serial: {str(e)}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback:", exc_info=True)
             server_state.mode = ConnectionMode.DISCONNECTED
             return {"status": "error", "error_type": "UnexpectedError", "error": str(e)}
 
-    async def read(self, wait=False, timeout=1.0):
+    async def read(self, wait=False, timeout=1.0, batch_window=0.0):
         """
         Read messages from the buffer.
         
         Args:
             wait (bool): Whether to wait for messages if buffer is empty
             timeout (float): Time to wait for messages in seconds
+            batch_window (float): When waiting, time in seconds to keep collecting
+                                  after the first message arrives, so a burst is
+                                  returned in one read
             
         Returns:
             dict: Messages or status
@@ -337,6 +519,8 @@ class SerialClient:
                 raise ValueError("Wait parameter must be a boolean")
             if not isinstance(timeout, (int, float)) or timeout <= 0:
                 raise ValueError(f"Invalid timeout: {timeout}. Must be a positive number.")
+            if not isinstance(batch_window, (int, float)) or batch_window < 0:
+                raise ValueError(f"Invalid batch window: {batch_window}. Must be a non-negative number.")
             
             # Check if serial is initialized
             if self.buffer is None:
@@ -344,28 +528,31 @@ class SerialClient:
             
             # Non-waiting read
             if not wait:
-                async with self.lock:
-                    if self.buffer:
-                        # Read all available messages
-                        messages = []
-                        while self.buffer:
-                            messages.append(self.buffer.popleft())
-                        return {"status": "success", "mode": "real", "messages": messages}
+                if self.buffer:
+                    # Read all available messages
+                    messages = self.buffer.drain()
+                    return {"status": "success", "mode": "real", "messages": messages}
                 return {"status": "no_messages", "mode": "real", "messages": []}
             
-            # Waiting read with timeout
+            # Waiting read with timeout - woken by the receive loop as soon as data arrives
             try:
-                end_time = asyncio.get_event_loop().time() + timeout
-                while asyncio.get_event_loop().time() < end_time:
-                    async with self.lock:
-                        if self.buffer:
-                            # Read all available messages
-                            messages = []
-                            while self.buffer:
-                                messages.append(self.buffer.popleft())
-                            return {"status": "success", "mode": "real", "messages": messages}
-                    await asyncio.sleep(0.05)
-                return {"status": "timeout", "mode": "real", "messages": []}
+                loop = asyncio.get_running_loop()
+                end_time = loop.time() + timeout
+                while not self.buffer:
+                    remaining = end_time - loop.time()
+                    if remaining <= 0 or not await self.wait_for_data(remaining):
+                        return {"status": "timeout", "mode": "real", "messages": []}
+                
+                # Collect the rest of a burst, but stop before the buffer would overflow
+                batch_end = loop.time() + batch_window
+                while len(self.buffer) < self.buffer.capacity:
+                    remaining = batch_end - loop.time()
+                    if remaining <= 0 or not await self.wait_for_data(remaining):
+                        break
+                
+                # Read all available messages
+                messages = self.buffer.drain()
+                return {"status": "success", "mode": "real", "messages": messages}
             except asyncio.CancelledError:
                 raise
             
@@ -377,17 +564,102 @@ class SerialClient:
             return {"status": "error", "error_type": "ValueError", "error": str(e)}
         except Exception as e:
             logger.error(f"Unexpected error reading messages: {str(e)}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback:", exc_info=True)
+            return {"status": "error", "error_type": "UnexpectedError", "error": str(e)}
+
+    async def reconfigure(self, baudrate):
+        """
+        Change the baudrate of the open port without closing and reopening it.
+        
+        Args:
+            baudrate (int): New communication speed in bauds
+            
+        Returns:
+            dict: Status of the reconfiguration
+        """
+        try:
+            # Validate input
+            if not isinstance(baudrate, int) or baudrate <= 0:
+                raise ValueError(f"Invalid baudrate: {baudrate}. Must be a positive integer.")
+            
+            # Check if serial is initialized
+            if not self.serial_port or not self.serial_port.is_open:
+                raise SerialConnectionError("Serial port not initialized or not open")
+            
+            # pyserial applies the new speed to the open port (termios / SetCommState)
+            try:
+                self.serial_port.baudrate = baudrate
+            except (serial.SerialException, ValueError) as e:
+                raise SerialConnectionError(f"Failed to change baudrate: {str(e)}")
+            
+            server_state.baudrate = baudrate
+            logger.info(f"Serial baudrate changed to {baudrate} on {server_state.port}")
+            return {"status": "reconfigured", "mode": "real", "port": server_state.port, "baudrate": baudrate}
+        except SerialClientError as e:
+            logger.error(f"Serial client error: {str(e)}")
+            return {"status": "error", "error_type": e.__class__.__name__, "error": str(e)}
+        except ValueError as e:
+            logger.error(f"Invalid parameter: {str(e)}")
+            return {"status": "error", "error_type": "ValueError", "error": str(e)}
+        except Exception as e:
+            logger.error(f"Unexpected error changing baudrate: {str(e)}")
+            logger.debug("Traceback:", exc_info=True)
             return {"status": "error", "error_type": "UnexpectedError", "error": str(e)}
 
+    async def wait_for_data(self, timeout):
+        """
+        Wait until new messages are buffered.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+            
+        Returns:
+            bool: True if new messages arrived, False on timeout
+        """
+        self._data_event.clear()
+        try:
+            if _HAS_ASYNCIO_TIMEOUT:
+                # Cancels the current task on expiry instead of wrapping the wait in a new task
+                async with asyncio.timeout(timeout):
+                    await self._data_event.wait()
+            else:
+                await asyncio.wait_for(self._data_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def read_response(self, timeout, batch_window=0.0):
+        """
+        Wait for new messages, then collect the rest of the burst.
+        
+        Args:
+            timeout (float): Maximum total time in seconds, burst collection included
+            batch_window (float): Time in seconds to keep collecting after the
+                                  first new message arrives
+            
+        Returns:
+            dict: Messages or status, as returned by read()
+        """
+        loop = asyncio.get_running_loop()
+        end_time = loop.time() + timeout
+        if not await self.wait_for_data(timeout):
+            return {"status": "timeout", "mode": "real", "messages": []}
+        
+        remaining = end_time - loop.time()
+        if remaining <= 0:
+            return await self.read(wait=False)
+        # The burst window never extends past timeout
+        return await self.read(True, remaining, min(batch_window, remaining))
+
     async def close(self):
         """Close the serial connection and clean up resources."""
         try:
             # If already disconnected, do nothing
-            if server_state.mode == ConnectionMode.DISCONNECTED:
+            if server_state.is_disconnected:
                 return {"status": "already_closed"}
                 
             self.is_closing = True
+            self._stop_fd_reader()
             
             # Cancel receive task if running
             if self.receive_task:
@@ -402,6 +674,12 @@ class SerialClient:
                     logger.error(f"Error cancelling receive task: {str(e)}")
                 finally:
                     self.receive_task = None
+                
+                # Let an in-flight read in the reader thread return before the port is closed
+                try:
+                    await asyncio.get_running_loop().run_in_executor(self._reader_executor, lambda: None)
+                except Exception as e:
+                    logger.error(f"Error waiting for reader thread: {str(e)}")
             
             # Close serial port
             if self.serial_port:
@@ -417,11 +695,12 @@ class SerialClient:
             # Update server state
             server_state.mode = ConnectionMode.DISCONNECTED
             server_state.port = None
+            server_state.invalidate_ports_cache()
                     
             return {"status": "closed", "mode": "real"}
         except Exception as e:
             logger.error(f"Unexpected error closing serial: {str(e)}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback:", exc_info=True)
             server_state.mode = ConnectionMode.DISCONNECTED
             server_state.set_error(f"Error closing connection: {str(e)}")
             return {"status": "error", "error": str(e)}
@@ -432,33 +711,30 @@ class SerialClient:
             if not server_state.serial_available:
                 # Return empty list if serial is not available
                 server_state.available_ports = []
+                server_state.available_ports_set = set()
                 server_state.last_ports_check = time.time()
                 return {"status": "error", "error": "Serial module not available"}
                 
-            # Check if we should refresh ports or use cached data
+            # Check if we should refresh ports or use cached data (an empty result is cached too)
             current_time = time.time()
-            if (current_time - server_state.last_ports_check) < server_state.ports_check_interval and server_state.available_ports:
-                ports = []
-                for port_name in server_state.available_ports:
-                    ports.append({
-                        "device": port_name,
-                        "name": port_name,
-                        "description": "Cached port entry",
-                        "hwid": "CACHED"
-                    })
-                return {"status": "success", "ports": ports, "cached": True}
+            if (current_time - server_state.last_ports_check) < server_state.ports_check_interval and server_state.cached_ports_payload is not None:
+                return {"status": "success", "ports": server_state.cached_ports_payload, "devices": server_state.available_ports, "cached": True}
                 
             # Get fresh port list
             ports = []
+            scan_ok = False
             try:
                 # First try the standard method
                 available_ports = list(serial.tools.list_ports.comports())
                 logger.info(f"Found {len(available_ports)} ports using standard method")
                 
-                # Also try glob pattern for USB devices
-                import glob
-                usb_ports = glob.glob('/dev/tty.usb*')
-                logger.info(f"Found {len(usb_ports)} USB ports using glob pattern")
+                # Also scan /dev for USB devices (simple prefix match, no glob/fnmatch needed)
+                try:
+                    with os.scandir('/dev') as entries:
+                        usb_ports = ['/dev/' + e.name for e in entries if e.name.startswith('tty.usb')]
+                except OSError:
+                    usb_ports = []  # No /dev, e.g. on Windows
+                logger.info(f"Found {len(usb_ports)} USB ports in /dev")
                 
                 # Combine both methods
                 all_ports = set()
@@ -489,22 +765,29 @@ class SerialClient:
                         logger.warning(f"Error getting info for port {port_path}: {str(e)}")
                 
                 logger.info(f"Total unique ports found: {len(ports)}")
+                scan_ok = True
                 
             except Exception as e:
                 logger.error(f"Error listing ports: {str(e)}")
-                logger.debug(traceback.format_exc())
+                logger.debug("Traceback:", exc_info=True)
             
-            # Update state cache
+            # Update state (device names are built once here and reused by all callers)
             server_state.available_ports = [p["device"] for p in ports]
-            server_state.last_ports_check = current_time
+            server_state.available_ports_set = set(server_state.available_ports)
+            if scan_ok:
+                server_state.cached_ports_payload = ports
+                server_state.last_ports_check = current_time
+            else:
+                # Never cache a failed scan; the next call retries it
+                server_state.invalidate_ports_cache()
             
             if not ports:
                 logger.warning("No serial ports found")
                 
-            return {"status": "success", "ports": ports, "cached": False}
+            return {"status": "success", "ports": ports, "devices": server_state.available_ports, "cached": False}
         except Exception as e:
             logger.error(f"Error listing serial ports: {str(e)}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback:", exc_info=True)
             return {"status": "error", "error": str(e)}
 
     def get_state(self):
@@ -535,8 +818,8 @@ class SerialClient:
                 raise ValueError("Message must be a string")
             if not message:
                 raise ValueError("Message cannot be empty")
-            if len(message) > 1000:
-                raise ValueError("Message too long (max 1000 characters)")
+            if len(message) > MAX_MESSAGE_LENGTH:
+                raise ValueError(f"Message too long (max {MAX_MESSAGE_LENGTH} characters)")
             if not isinstance(timeout, (int, float)) or timeout <= 0:
                 raise ValueError("Timeout must be a positive number")
                 
@@ -551,11 +834,11 @@ class SerialClient:
                 self.serial_port.write_timeout = timeout
                 
                 # Send the message
-                logger.debug(f"Port status before write: is_open={self.serial_port.is_open}")
+                logger.debug("Port status before write: is_open=%s", self.serial_port.is_open)
                 bytes_written = self.serial_port.write(message.encode('utf-8'))
-                logger.debug(f"Wrote {bytes_written} bytes, port status: is_open={self.serial_port.is_open}")
+                logger.debug("Wrote %s bytes, port status: is_open=%s", bytes_written, self.serial_port.is_open)
                 self.serial_port.flush()  # Ensure data is sent
-                logger.debug(f"Port status after flush: is_open={self.serial_port.is_open}")
+                logger.debug("Port status after flush: is_open=%s", self.serial_port.is_open)
                 
                 # Restore original timeout
                 self.serial_port.write_timeout = original_timeout
@@ -593,7 +876,7 @@ class SerialClient:
             }
         except Exception as e:
             logger.error(f"Unexpected error sending message: {str(e)}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback:", exc_info=True)
             return {
                 "status": "error",
                 "error_type": "UnexpectedError",
@@ -617,10 +900,18 @@ class SendMessageInput(BaseModel):
     wait_for_response: bool = False
     response_timeout: float = 0.5
     send_timeout: float = 1.0  # Timeout for the send operation itself
+    batch_window_ms: float = 100.0  # Collection time after the first response line, e.g. echo then answer
 
 class ReadMessageInput(BaseModel):
     wait: bool = False
     timeout: float = 1.0
+    batch_window_ms: float = 16.0  # Extra collection time after the first message when waiting
+
+class QueryInput(BaseModel):
+    message: str
+    response_timeout: float = 1.0  # Maximum total wait, burst collection included
+    send_timeout: float = 1.0
+    batch_window_ms: float = 16.0  # Extra collection time after the first response line
 
 class ConfigureSerialInput(BaseModel):
     port: Optional[str] = None
@@ -634,13 +925,13 @@ class DelayInput(BaseModel):
 async def init_serial(input: InitSerialInput) -> dict:
     """Initialize the serial connection with the specified parameters."""
     try:
-        logger.info(f"Initializing serial connection on port {input.port} with baudrate {input.baudrate}")
+        logger.info("Initializing serial connection on port %s with baudrate %s", input.port, input.baudrate)
         
         result = await serial_client.init(input.port, input.baudrate, input.buffer_length)
         
         if result.get("status") == "initialized":
             mode = result.get("mode", "unknown")
-            logger.info(f"Serial connection {mode} successfully")
+            logger.info("Serial connection %s successfully", mode)
             return {
                 "success": True, 
                 "status": result.get("status"), 
@@ -662,16 +953,29 @@ async def init_serial(input: InitSerialInput) -> dict:
         logger.error(f"Failed to initialize serial connection: {str(e)}")
         return {"success": False, "status": "error", "message": str(e)}
 
+# Fields shared by every successful send_message response
+SEND_SUCCESS_FIELDS = {
+    "success": True,
+    "write_status": "success",
+    "connection_state": "connected"
+}
+
+# (connection_state, write_status) reported for send errors; anything else is ("error", "failed")
+SEND_ERROR_STATES = {
+    "NotConnected": ("disconnected", "failed"),
+    "SerialTimeoutException": ("connected", "timeout")
+}
+
 @mcp.tool()
 async def send_message(input: SendMessageInput) -> dict:
     """Send a message through the serial connection and optionally wait for a response."""
     # Check if we're in disconnected mode and need to handle gracefully
-    if server_state.mode == ConnectionMode.DISCONNECTED:
+    if server_state.is_disconnected:
         logger.warning("Attempted to send message while disconnected")
         
         # Try to list available ports for helpful error message
         ports_result = await serial_client.list_ports()
-        available_ports = [p.get("device") for p in ports_result.get("ports", [])]
+        available_ports = ports_result.get("devices", [])
         
         return {
             "success": False, 
@@ -684,60 +988,56 @@ async def send_message(input: SendMessageInput) -> dict:
         }
         
     try:
-        logger.debug(f"Sending message: {input.message}")
+        logger.debug("Sending message: %s", input.message)
         result = await serial_client.send(input.message, timeout=input.send_timeout)
         
         if result.get("status") == "success":
             mode = result.get("mode", "unknown")
             bytes_written = result.get("bytes_written", 0)
-            logger.info(f"Message sent ({mode} mode): {input.message}")
+            logger.info("Message sent (%s mode): %s", mode, input.message)
             
-            # Check for response if requested
-            response_status = "not_checked"
-            response_messages = []
-            
-            if input.wait_for_response:
-                try:
-                    # First wait for the specified delay before checking for response
-                    logger.debug(f"Waiting {input.response_timeout}s for response, buffer status before sleep: {serial_client.buffer is not None}")
-                    await asyncio.sleep(input.response_timeout)
-                    logger.debug(f"Sleep completed, buffer status after sleep: {serial_client.buffer is not None}")
-                    
-                    # Then check for any messages that arrived during the wait
-                    response = await serial_client.read(wait=False)
-                    if response.get("status") == "success" and response.get("messages"):
-                        response_status = "received"
-                        response_messages = response.get("messages", [])
-                    else:
-                        response_status = "no_response"
-                except Exception as e:
-                    logger.warning(f"Error checking for response: {str(e)}")
-                    response_status = "error"
-            
-            return {
-                "success": True, 
+            response = {
+                **SEND_SUCCESS_FIELDS,
                 "status": result.get("status"), 
                 "mode": mode,
-                "write_status": "success",
-                "connection_state": "connected",
-                "response_status": response_status,
-                "response_messages": response_messages,
                 "bytes_written": bytes_written,
                 "message": f"Message sent successfully in {mode} mode"
             }
+            
+            # Fast path: no response check requested
+            if not input.wait_for_response:
+                response["response_status"] = "not_checked"
+                return response
+            
+            # Check for response
+            response_messages = []
+            try:
+                # Wait until the device answers, then collect the rest of a multi-line reply
+                logger.debug("Waiting up to %ss for response, buffer status: %s", input.response_timeout, serial_client.buffer is not None)
+                read_result = await serial_client.read_response(input.response_timeout, input.batch_window_ms / 1000)
+                logger.debug("Response wait completed: %s", read_result.get("status"))
+                
+                if read_result.get("status") == "success" and read_result.get("messages"):
+                    response_status = "received"
+                    response_messages = read_result.get("messages", [])
+                elif read_result.get("status") in ("timeout", "no_messages"):
+                    response_status = "no_response"
+                else:
+                    logger.warning(f"Error checking for response: {read_result.get('error')}")
+                    response_status = "error"
+            except Exception as e:
+                logger.warning(f"Error checking for response: {str(e)}")
+                response_status = "error"
+            
+            response["response_status"] = response_status
+            response["response_messages"] = response_messages
+            return response
         else:
             logger.warning(f"Send operation returned: {result}")
             
             # Determine the specific failure reason
             error_type = result.get("error_type", "unknown")
-            if error_type == "NotConnected":
-                connection_state = "disconnected"
-            elif error_type == "SerialTimeoutException":
-                connection_state = "connected"
-                write_status = "timeout"
-            else:
-                connection_state = "error"
-                write_status = "failed"
+            connection_state, write_status = SEND_ERROR_STATES.get(error_type, ("error", "failed"))
             
             return {
                 "success": False, 
@@ -764,12 +1064,12 @@ async def send_message(input: SendMessageInput) -> dict:
 async def read_message(input: ReadMessageInput) -> dict:
     """Read messages from the serial connection."""
     # Check if we're in disconnected mode and need to handle gracefully
-    if server_state.mode == ConnectionMode.DISCONNECTED:
+    if server_state.is_disconnected:
         logger.warning("Attempted to read message while disconnected")
         
         # Try to list available ports for helpful error message
         ports_result = await serial_client.list_ports()
-        available_ports = [p.get("device") for p in ports_result.get("ports", [])]
+        available_ports = ports_result.get("devices", [])
         
         return {
             "success": False, 
@@ -780,15 +1080,15 @@ async def read_message(input: ReadMessageInput) -> dict:
         }
     
     try:
-        logger.debug(f"Reading messages (wait={input.wait}, timeout={input.timeout})")
-        result = await serial_client.read(input.wait, input.timeout)
+        logger.debug("Reading messages (wait=%s, timeout=%s, batch_window_ms=%s)", input.wait, input.timeout, input.batch_window_ms)
+        result = await serial_client.read(input.wait, input.timeout, input.batch_window_ms / 1000)
         
         if result.get("status") == "success":
             messages = result.get("messages", [])
             mode = result.get("mode", "unknown")
             
             if messages:
-                logger.info(f"Read {len(messages)} messages ({mode} mode)")
+                logger.info("Read %d messages (%s mode)", len(messages), mode)
                 return {
                     "success": True, 
                     "status": "success", 
@@ -816,6 +1116,99 @@ async def read_message(input: ReadMessageInput) -> dict:
         logger.error(f"Failed to read messages: {str(e)}")
         return {"success": False, "status": "error", "message": str(e)}
 
+@mcp.tool()
+async def query(input: QueryInput) -> dict:
+    """Send a message and return the device's response in a single call.
+    
+    Preferred over send_message followed by read_message for command/response devices.
+    """
+    if server_state.is_disconnected:
+        logger.warning("Attempted to query while disconnected")
+        
+        # Try to list available ports for helpful error message
+        ports_result = await serial_client.list_ports()
+        available_ports = ports_result.get("devices", [])
+        
+        return {
+            "success": False, 
+            "status": "not_connected",
+            "message": "Serial not connected. Please initialize a connection first using init_serial.",
+            "available_ports": available_ports,
+            "mode": server_state.mode
+        }
+    
+    try:
+        # Validate input before anything is written to the port
+        if not isinstance(input.response_timeout, (int, float)) or input.response_timeout <= 0:
+            raise ValueError(f"Invalid response timeout: {input.response_timeout}. Must be a positive number.")
+        if not isinstance(input.batch_window_ms, (int, float)) or input.batch_window_ms < 0:
+            raise ValueError(f"Invalid batch window: {input.batch_window_ms}. Must be a non-negative number.")
+        
+        # Set aside messages that arrived before the send, so they are not taken for the response
+        earlier = await serial_client.read(wait=False)
+        if earlier.get("status") not in ("success", "no_messages"):
+            logger.warning(f"Error draining earlier messages: {earlier.get('error')}")
+            return {
+                "success": False,
+                "status": "error",
+                "error_type": earlier.get("error_type", "unknown"),
+                "message": f"Failed to read buffered messages: {earlier.get('error', 'Unknown error')}",
+                "error_details": earlier
+            }
+        earlier_messages = earlier.get("messages", [])
+        
+        logger.debug("Querying: %s", input.message)
+        result = await serial_client.send(input.message, timeout=input.send_timeout)
+        
+        if result.get("status") != "success":
+            logger.warning(f"Send operation returned: {result}")
+            return {
+                "success": False,
+                "status": result.get("status"),
+                "error_type": result.get("error_type", "unknown"),
+                "message": f"Failed to send: {result.get('error', 'Unknown error')}",
+                "error_details": result,
+                "earlier_messages": earlier_messages
+            }
+        
+        # Wait for the first response line, then collect the rest of the burst
+        response = await serial_client.read_response(input.response_timeout, input.batch_window_ms / 1000)
+        if response.get("status") not in ("success", "timeout", "no_messages"):
+            logger.warning(f"Error reading response: {response.get('error')}")
+            return {
+                "success": False,
+                "status": "error",
+                "error_type": response.get("error_type", "unknown"),
+                "message": f"Failed to read response: {response.get('error', 'Unknown error')}",
+                "error_details": response,
+                "earlier_messages": earlier_messages
+            }
+        messages = response.get("messages", [])
+        
+        mode = result.get("mode", "unknown")
+        logger.info("Query sent (%s mode), %d response messages", mode, len(messages))
+        return {
+            "success": True,
+            "status": "received" if messages else "no_response",
+            "mode": mode,
+            "bytes_written": result.get("bytes_written", 0),
+            "messages": messages,
+            "earlier_messages": earlier_messages,
+            "message": f"Received {len(messages)} response messages" if messages else "No response within timeout"
+        }
+    except ValueError as e:
+        logger.error(f"Invalid query parameter: {str(e)}")
+        return {
+            "success": False,
+            "status": "error",
+            "error_type": "ValueError",
+            "message": str(e),
+            "error_details": {"status": "error", "error_type": "ValueError", "error": str(e)}
+        }
+    except Exception as e:
+        logger.error(f"Failed to query: {str(e)}")
+        return {"success": False, "status": "error", "error_type": "UnexpectedError", "message": str(e)}
+
 @mcp.tool()
 async def close_serial() -> dict:
     """Close the serial connection."""
@@ -851,7 +1244,7 @@ async def list_serial_ports() -> dict:
         
         if result.get("status") in ["success", "simulated"]:
             port_details = result.get("ports", [])
-            port_list = [port.get("device") for port in port_details]
+            port_list = result.get("devices", [])
             
             message = f"Found {len(port_list)} serial ports"
             if result.get("status") == "simulated":
@@ -905,16 +1298,30 @@ async def configure_serial(input: ConfigureSerialInput) -> dict:
             }
             
         # Get current configuration
-        current_port = server_state.port or os.environ.get(ENV_PORT, DEFAULT_PORT)
-        current_baudrate = server_state.baudrate or int(os.environ.get(ENV_BAUD, DEFAULT_BAUD))
-        current_buffer = server_state.buffer_length or int(os.environ.get(ENV_BUFFER, DEFAULT_BUFFER))
+        current_port = server_state.port or CONFIGURED_PORT
+        current_baudrate = server_state.baudrate or CONFIGURED_BAUD
+        current_buffer = server_state.buffer_length or CONFIGURED_BUFFER
         
         # Update with new values if provided
         config_port = input.port if input.port is not None else current_port
         config_baudrate = input.baudrate if input.baudrate is not None else current_baudrate
         
         # Initialize with updated configuration
-        logger.info(f"Reconfiguring serial: {config_port} at {config_baudrate} baud")
+        logger.info("Reconfiguring serial: %s at %s baud", config_port, config_baudrate)
+        
+        # Same port already open: change the baudrate in place instead of reopening the port
+        if not server_state.is_disconnected and config_port == server_state.port:
+            result = await serial_client.reconfigure(config_baudrate)
+            if result.get("status") == "reconfigured":
+                return {
+                    "success": True,
+                    "status": "reconfigured",
+                    "mode": result.get("mode"),
+                    "port": config_port,
+                    "baudrate": config_baudrate,
+                    "message": f"Serial reconfigured to {config_port} at {config_baudrate} baud"
+                }
+            logger.warning(f"In-place reconfiguration failed, reopening port: {result}")
         
         # Use the init_serial tool for consistent behavior
         init_result = await init_serial(InitSerialInput(
@@ -957,7 +1364,7 @@ async def get_serial_status() -> dict:
         
         # Add extra information about port availability
         port_info = await serial_client.list_ports()
-        available_ports = [p.get("device") for p in port_info.get("ports", [])]
+        available_ports = port_info.get("devices", [])
         
         status_message = f"Serial status: {state['mode']}"
         if state["port"]:
@@ -1000,10 +1407,11 @@ async def delay(input: DelayInput) -> dict:
         if not isinstance(input.delay, (int, float)) or input.delay < 0:
             raise ValueError("Delay must be a positive number")
             
-        start_time = time.time()
+        # Event loop clock is monotonic, so NTP adjustments don't skew the measurement
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         await asyncio.sleep(input.delay)
-        end_time = time.time()
-        actual_delay = end_time - start_time
+        actual_delay = loop.time() - start_time
         
         return {
             "success": True,
@@ -1026,155 +1434,199 @@ async def delay(input: DelayInput) -> dict:
             "error": str(e)
         }
 
-@mcp.tool()
-async def help() -> dict:
-    """Returns detailed instructions on how to use the Serial MCP server.
-    
-    Returns:
-        dict: Structured help information including tool descriptions, parameters, and examples
-    """
-    help_info = {
-        "description": "Serial MCP is a robust serial communication server that provides a reliable interface for serial port communication.",
-        "tools": {
-            "delay": {
-                "description": "Wait for a specified number of seconds",
-                "parameters": {
-                    "delay": "Number of seconds to wait (must be positive)"
-                },
-                "example": {
-                    "input": {"delay": 2.5},
-                    "output": {
-                        "success": True,
-                        "status": "completed",
-                        "requested_delay": 2.5,
-                        "actual_delay": 2.501,
-                        "message": "Waited for 2.501 seconds"
-                    }
-                }
+# Static help payload, built once at import
+HELP_INFO = {
+    "description": "Serial MCP is a robust serial communication server that provides a reliable interface for serial port communication.",
+    "tools": {
+        "delay": {
+            "description": "Wait for a specified number of seconds",
+            "parameters": {
+                "delay": "Number of seconds to wait (must be positive)"
             },
-            "init_serial": {
-                "description": "Initialize a serial connection with specified parameters",
-                "parameters": {
-                    "port": "Serial port device path (e.g., '/dev/tty.usbmodem1101')",
-                    "baudrate": "Communication speed in bauds (default: 9600)",
-                    "buffer_length": "Maximum number of messages to buffer (default: 100)"
-                },
-                "example": {
-                    "input": {
-                        "port": "/dev/tty.usbmodem1101",
-                        "baudrate": 9600,
-                        "buffer_length": 100
-                    }
+            "example": {
+                "input": {"delay": 2.5},
+                "output": {
+                    "success": True,
+                    "status": "completed",
+                    "requested_delay": 2.5,
+                    "actual_delay": 2.501,
+                    "message": "Waited for 2.501 seconds"
                 }
+            }
+        },
+        "init_serial": {
+            "description": "Initialize a serial connection with specified parameters",
+            "parameters": {
+                "port": "Serial port device path (e.g., '/dev/tty.usbmodem1101')",
+                "baudrate": "Communication speed in bauds (default: 9600)",
+                "buffer_length": "Maximum number of messages to buffer (default: 100)"
             },
-            "send_message": {
-                "description": "Send a message through the serial connection and optionally wait for a response",
-                "parameters": {
-                    "message": "Message to send",
-                    "wait_for_response": "Whether to wait for a response (default: False)",
-                    "response_timeout": "Time in seconds to wait before checking for a response (default: 0.5). This is a pure delay after the message is sent.",
-                    "send_timeout": "Timeout in seconds for the send operation itself (default: 1.0)"
-                },
-                "example": {
-                    "input": {
-                        "message": "Hello",
-                        "wait_for_response": True,
-                        "response_timeout": 0.5,
-                        "send_timeout": 1.0
-                    },
-                    "sequence": [
-                        "1. Send message with send_timeout (1.0s)",
-                        "2. If wait_for_response is True, wait for response_timeout (0.5s)",
-                        "3. Check buffer for any messages that arrived during the wait",
-                        "4. Return results"
-                    ]
+            "example": {
+                "input": {
+                    "port": "/dev/tty.usbmodem1101",
+                    "baudrate": 9600,
+                    "buffer_length": 100
                 }
+            }
+        },
+        "send_message": {
+            "description": "Send a message through the serial connection and optionally wait for a response",
+            "parameters": {
+                "message": "Message to send",
+                "wait_for_response": "Whether to wait for a response (default: False)",
+                "response_timeout": "Maximum time in seconds to wait for a response, burst collection included (default: 0.5)",
+                "send_timeout": "Timeout in seconds for the send operation itself (default: 1.0)",
+                "batch_window_ms": "Milliseconds to keep collecting after the first response line, so an echo and the answer come back together (default: 100). Set to response_timeout or more to collect everything arriving within response_timeout"
             },
-            "read_message": {
-                "description": "Read messages from the buffer",
-                "parameters": {
-                    "wait": "Whether to wait for messages if buffer is empty (default: False)",
-                    "timeout": "Time to wait for messages in seconds (default: 1.0)"
+            "example": {
+                "input": {
+                    "message": "Hello",
+                    "wait_for_response": True,
+                    "response_timeout": 0.5,
+                    "send_timeout": 1.0
                 },
-                "example": {
-                    "input": {
-                        "wait": False,
-                        "timeout": 1.0
-                    }
-                }
-            },
-            "list_serial_ports": {
-                "description": "List all available serial ports on the system",
-                "parameters": "None",
-                "example": "await list_serial_ports()"
-            },
-            "get_serial_status": {
-                "description": "Get the current status of the serial connection",
-                "parameters": "None",
-                "example": "await get_serial_status()"
+                "sequence": [
+                    "1. Send message with send_timeout (1.0s)",
+                    "2. If wait_for_response is True, wait until a response arrives (at most response_timeout, 0.5s)",
+                    "3. Keep collecting for batch_window_ms (100ms) after the first response line, never past response_timeout",
+                    "4. Return results"
+                ]
+            }
+        },
+        "read_message": {
+            "description": "Read messages from the buffer",
+            "parameters": {
+                "wait": "Whether to wait for messages if buffer is empty (default: False)",
+                "timeout": "Time to wait for messages in seconds (default: 1.0)",
+                "batch_window_ms": "When waiting, milliseconds to keep collecting after the first message so a burst is returned at once (default: 16, 0 returns immediately)"
             },
-            "configure_serial": {
-                "description": "Configure the serial connection after initialization",
-                "parameters": {
-                    "port": "New port to use (optional)",
-                    "baudrate": "New baudrate to use (optional)",
-                    "list_ports": "Whether to just list ports (default: False)"
-                },
-                "example": {
-                    "input": {
-                        "port": "/dev/tty.usbmodem1101",
-                        "baudrate": 9600,
-                        "list_ports": False
-                    }
+            "example": {
+                "input": {
+                    "wait": False,
+                    "timeout": 1.0,
+                    "batch_window_ms": 16
                 }
-            },
-            "close_serial": {
-                "description": "Close the current serial connection",
-                "parameters": "None",
-                "example": "await close_serial()"
             }
         },
-        "common_responses": {
-            "success": {
-                "description": "Operation completed successfully",
-                "fields": ["success", "status", "message"]
+        "list_serial_ports": {
+            "description": "List all available serial ports on the system",
+            "parameters": "None",
+            "example": "await list_serial_ports()"
+        },
+        "get_serial_status": {
+            "description": "Get the current status of the serial connection",
+            "parameters": "None",
+            "example": "await get_serial_status()"
+        },
+        "configure_serial": {
+            "description": "Configure the serial connection after initialization",
+            "parameters": {
+                "port": "New port to use (optional)",
+                "baudrate": "New baudrate to use (optional)",
+                "list_ports": "Whether to just list ports (default: False)"
             },
-            "error": {
-                "description": "Operation failed",
-                "fields": ["success", "status", "error_type", "message", "error_details"]
+            "example": {
+                "input": {
+                    "port": "/dev/tty.usbmodem1101",
+                    "baudrate": 9600,
+                    "list_ports": False
+                }
+            }
+        },
+        "query": {
+            "description": "Send a message and return the response in one call (preferred for command/response devices)",
+            "parameters": {
+                "message": "Message to send",
+                "response_timeout": "Maximum time in seconds to wait for a response, burst collection included (default: 1.0)",
+                "send_timeout": "Timeout in seconds for the send operation itself (default: 1.0)",
+                "batch_window_ms": "Milliseconds to keep collecting after the first response line (default: 16)"
             },
-            "not_connected": {
-                "description": "Serial port is not connected",
-                "fields": ["success", "status", "message", "available_ports"]
+            "example": {
+                "input": {
+                    "message": "STATUS\n",
+                    "response_timeout": 1.0
+                },
+                "output": {
+                    "success": True,
+                    "status": "received",
+                    "mode": "real",
+                    "bytes_written": 7,
+                    "messages": [{"timestamp": "2025-01-01T12:00:00.000000", "message": "OK"}],
+                    "earlier_messages": [],
+                    "message": "Received 1 response messages"
+                }
             }
         },
-        "connection_states": {
-            "connected": "Serial port is connected and available",
-            "disconnected": "No active serial connection",
-            "error": "Connection in error state"
+        "close_serial": {
+            "description": "Close the current serial connection",
+            "parameters": "None",
+            "example": "await close_serial()"
+        }
+    },
+    "common_responses": {
+        "success": {
+            "description": "Operation completed successfully",
+            "fields": ["success", "status", "message"]
         },
-        "response_statuses": {
-            "not_checked": "Response check was not requested",
-            "received": "Response was received",
-            "no_response": "No response received within timeout",
-            "error": "Error occurred while checking for response"
+        "error": {
+            "description": "Operation failed",
+            "fields": ["success", "status", "error_type", "message", "error_details"]
         },
-        "usage_notes": [
-            "Always initialize the connection using init_serial before sending messages",
-            "Check connection status using get_serial_status if unsure about connection state",
-            "Use list_serial_ports to discover available serial ports",
-            "Messages in the buffer include timestamps and are limited to 1000 characters",
-            "The buffer can hold up to 100 messages by default",
-            "Non-printable characters in messages are skipped"
-        ]
-    }
+        "not_connected": {
+            "description": "Serial port is not connected",
+            "fields": ["success", "status", "message", "available_ports"]
+        }
+    },
+    "connection_states": {
+        "connected": "Serial port is connected and available",
+        "disconnected": "No active serial connection",
+        "error": "Connection in error state"
+    },
+    "response_statuses": {
+        "not_checked": "Response check was not requested",
+        "received": "Response was received",
+        "no_response": "No response received within timeout",
+        "error": "Error occurred while checking for response"
+    },
+    "usage_notes": [
+        "Always initialize the connection using init_serial before sending messages",
+        "For command/response devices, use query instead of send_message followed by read_message",
+        "query returns messages buffered before the send separately in earlier_messages, never as the response",
+        "Check connection status using get_serial_status if unsure about connection state",
+        "Use list_serial_ports to discover available serial ports",
+        "Messages in the buffer include timestamps and are limited to 1000 characters",
+        "The buffer can hold up to 100 messages by default",
+        "Non-printable characters in messages are skipped"
+    ]
+}
+
+@mcp.tool()
+async def help() -> dict:
+    """Returns detailed instructions on how to use the Serial MCP server.
     
+    Returns:
+        dict: Structured help information including tool descriptions, parameters, and examples
+    """
     return {
         "success": True,
         "status": "success",
-        "help": help_info
+        "help": HELP_INFO
     }
 
+def _quick_port_devices():
+    """Device names of likely serial ports without probing each port's metadata.
+    
+    Only used for the startup banner; list_serial_ports does the full scan.
+    """
+    if sys.platform.startswith('linux'):
+        patterns = ('/dev/ttyUSB*', '/dev/ttyACM*')
+    elif sys.platform == 'darwin':
+        patterns = ('/dev/tty.usb*',)
+    else:
+        # No cheap device listing on this platform (e.g. Windows)
+        return [port.device for port in serial.tools.list_ports.comports()]
+    return sorted(device for pattern in patterns for device in glob.glob(pattern))
+
 if __name__ == "__main__":
     try:
         # Log whether serial is available at startup
@@ -1184,9 +1636,9 @@ if __name__ == "__main__":
             
             # List available ports at startup for convenience
             try:
-                ports = list(serial.tools.list_ports.comports())
+                ports = _quick_port_devices()
                 if ports:
-                    print(f"Available serial ports: {[port.device for port in ports]}", file=sys.stderr)
+                    print(f"Available serial ports: {ports}", file=sys.stderr)
                 else:
                     print("No serial ports found. You can connect later when a port becomes available.", file=sys.stderr)
             except Exception as e:
@@ -1199,5 +1651,5 @@ if __name__ == "__main__":
         mcp.run()
     except Exception as e:
         logger.error(f"Error starting server: {str(e)}")
-        logger.debug(traceback.format_exc())
+        logger.debug("Traceback:", exc_info=True)
         sys.exit(1) 